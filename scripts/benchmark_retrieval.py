@@ -0,0 +1,153 @@
+import os
+import json
+import time
+import tempfile
+from pathlib import Path
+
+import faiss
+import numpy as np
+from sentence_transformers import SentenceTransformer
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_community.vectorstores import FAISS
+
+from retrieval_engine import CONFIG_FILE, EMBEDDING_MODEL, RetrievalEngine
+from retrieval_engine_langchain import EngineVectorStore
+
+'''
+Compares index load time and query latency of the original implementations
+against the shared retrieval engine and its LangChain adapter. Embedding
+models are loaded once up front, so load time is only the index / passages /
+docstore.
+
+The baselines are rebuilt from k8s_passages.json exactly as the original
+scripts did (IndexFlatL2 + JSON, LangChain FAISS.from_texts + save_local) in a
+temporary folder that is removed afterwards. The engine rows use the index
+built by faiss_index.py, with whatever INDEX_TYPE it was built with, and are
+reported with the query cache disabled and enabled, so index-type and
+batching gains show up separately from cache hits.
+
+cold   first pass over the queries, engine cache empty
+warm   later passes over the same queries (cache hits for cached rows)
+batch  all queries in one call, per query, engine cache empty
+'''
+
+REPEATS = int(os.environ.get('BENCH_REPEATS', '5'))
+QUERIES = [
+    "How does Kubernetes handle service discovery?",
+    "What are Init Containers?",
+    "How does a Kubernetes Service work?",
+    "What is a ConfigMap in Kubernetes?",
+    "How are secrets managed in Kubernetes?",
+    "What is a DaemonSet?",
+    "How does Kubernetes handle persistent storage?",
+    "What is a ReplicaSet?",
+    "How do liveness and readiness probes work?",
+    "How does Kubernetes manage container networking?"
+]
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+def latencies(search, reset=None):
+    if reset:
+        reset()
+    cold = [timed(lambda: search(q))[1] for q in QUERIES]
+    warm = [timed(lambda: search(q))[1] for _ in range(REPEATS - 1) for q in QUERIES]
+    return cold, warm or cold
+
+def report(name, load_ms, cold, warm, batch_ms):
+    print(f"{name:<38} {load_ms:>10.1f} {np.median(cold):>12.2f} {np.percentile(cold, 95):>12.2f} "
+          f"{np.median(warm):>12.2f} {batch_ms:>12.2f}")
+
+def build_baselines(base_dir, folder, st_model, hf_embeddings):
+    with open(base_dir / "k8s_passages.json", "r", encoding="utf-8") as f:
+        passages = json.load(f)
+
+    # Original faiss_index.py: IndexFlatL2 + passage list
+    plain_dir = folder / "plain"
+    plain_dir.mkdir()
+    embeddings = st_model.encode(passages, convert_to_numpy=True, show_progress_bar=True)
+    index = faiss.IndexFlatL2(embeddings.shape[1])
+    index.add(embeddings)
+    faiss.write_index(index, str(plain_dir / "k8s_faiss.index"))
+    with open(plain_dir / "k8s_passage_metadata.json", "w", encoding="utf-8") as f:
+        json.dump(passages, f)
+
+    # Original faiss_index_langchain.py: LangChain FAISS with a pickled docstore
+    langchain_dir = folder / "faiss_langchain_index"
+    FAISS.from_texts(passages, hf_embeddings).save_local(str(langchain_dir))
+    return plain_dir, langchain_dir
+
+def bench_engine(name, load, engine_of, search, batch):
+    for cache_size, label in ((0, "no cache"), (1024, "cache")):
+        store, load_ms = timed(lambda: load(cache_size))
+        engine = engine_of(store)
+        cold, warm = latencies(lambda q: search(store, q), reset=engine.clear_cache)
+        engine.clear_cache()
+        _, batch_ms = timed(lambda: batch(store))
+        report(f"{name} ({label})", load_ms, cold, warm, batch_ms / len(QUERIES))
+
+def main():
+    BASE_FOLDER = os.environ['BASE_FOLDER']
+    base_dir = Path(BASE_FOLDER) / "website" / "content" / "en" / "docs"
+
+    # Load embedding models once
+    st_model = SentenceTransformer(EMBEDDING_MODEL)
+    hf_embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
+    st_encoder = lambda texts, show_progress_bar=False: st_model.encode(texts, convert_to_numpy=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plain_dir, langchain_dir = build_baselines(base_dir, Path(tmp), st_model, hf_embeddings)
+
+        index_type = "flat"
+        if (base_dir / CONFIG_FILE).exists():
+            with open(base_dir / CONFIG_FILE, "r", encoding="utf-8") as f:
+                index_type = json.load(f).get("index_type", "flat")
+        print(f"{len(QUERIES)} queries x {REPEATS} passes, k=10, engine index: {index_type}, times in ms")
+        print(f"{'front-end':<38} {'load':>10} {'cold p50':>12} {'cold p95':>12} {'warm p50':>12} {'batch/query':>12}")
+
+        # Plain FAISS, original
+        def load_plain():
+            index = faiss.read_index(str(plain_dir / "k8s_faiss.index"))
+            with open(plain_dir / "k8s_passage_metadata.json", "r", encoding="utf-8") as f:
+                passages = json.load(f)
+            return index, passages
+        (index, passages), load_ms = timed(load_plain)
+
+        def search_plain(queries):
+            D, I = index.search(st_model.encode(queries, convert_to_numpy=True), k=10)
+            return [[passages[h] for h in hits] for hits in I]
+        cold, warm = latencies(lambda q: search_plain([q]))
+        _, batch_ms = timed(lambda: search_plain(QUERIES))
+        report("plain / original", load_ms, cold, warm, batch_ms / len(QUERIES))
+
+        # Plain FAISS, retrieval engine
+        bench_engine(
+            "plain / engine",
+            lambda cache_size: RetrievalEngine.load(base_dir, encoder=st_encoder, cache_size=cache_size),
+            lambda engine: engine,
+            lambda engine, q: engine.search(q, k=10),
+            lambda engine: engine.search(QUERIES, k=10)
+        )
+
+        # LangChain, original FAISS wrapper
+        vectorstore, load_ms = timed(lambda: FAISS.load_local(
+            str(langchain_dir), hf_embeddings, allow_dangerous_deserialization=True))
+        cold, warm = latencies(lambda q: vectorstore.similarity_search(q, k=10))
+        _, batch_ms = timed(lambda: [vectorstore.similarity_search(q, k=10) for q in QUERIES])
+        report("langchain / FAISS", load_ms, cold, warm, batch_ms / len(QUERIES))
+
+        # LangChain, engine adapter
+        bench_engine(
+            "langchain / engine adapter",
+            lambda cache_size: EngineVectorStore.load_local(
+                base_dir, hf_embeddings, cache_size=cache_size, symmetric_queries=True),
+            lambda adapter: adapter.engine,
+            lambda adapter, q: adapter.similarity_search(q, k=10),
+            lambda adapter: adapter.similarity_search_batch(QUERIES, k=10)
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import os
+import json
+import socket
+import tempfile
+import urllib.error
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+from retrieval_engine import RetrievalEngine, build_index
+from shard_coordinator import http_json, scatter_gather, start_local_workers, stop_workers, wait_until_healthy
+
+'''
+Runnable check for sharded retrieval, with local shard_worker.py processes
+standing in for the pods. No models are needed: it writes a tiny synthetic
+shard set into a temporary BASE_FOLDER and checks that
+
+- the merged top-k matches a single flat index over the whole corpus
+- a shard reached through two endpoints is only merged once
+- a worker serving the wrong shard or one that exited is caught by the health check
+- bad query vectors get a 400 instead of breaking the worker
+- a shard that never answers and a dead shard are skipped (partial results)
+- MIN_SHARDS fails the query once too few shards answer
+
+    python scripts/check_sharded_retrieval.py
+'''
+
+NUM_SHARDS = 3
+NUM_PASSAGES = 60
+DIMENSION = 8
+K = 5
+
+def write_shards(shard_dir, vectors):
+    # Same layout as faiss_index_sharded.py: one retrieval engine folder per shard
+    shards = []
+    for shard_id in range(NUM_SHARDS):
+        members = list(range(shard_id, len(vectors), NUM_SHARDS))
+        engine = RetrievalEngine(
+            build_index(vectors[members]),
+            [f"passage {i}" for i in members],
+            encoder=None,
+            config={"model": "synthetic", "index_type": "flat", "dimension": DIMENSION},
+            metadatas=[{"source": "en"} for _ in members]
+        )
+        engine.save(shard_dir / f"shard_{shard_id}")
+        shards.append({"shard_id": shard_id, "folder": f"shard_{shard_id}", "size": len(members)})
+    manifest = {"model": "synthetic", "index_type": "flat", "num_shards": NUM_SHARDS, "shards": shards}
+    with open(shard_dir / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+def expected_top_k(vectors, members, queries):
+    # Reference answer: one flat index over the given passages
+    index = faiss.IndexFlatL2(DIMENSION)
+    index.add(vectors[members])
+    _, I = index.search(queries, K)
+    return [[f"passage {members[h]}" for h in hits] for hits in I]
+
+def texts(merged):
+    assert all(hit["source"] == "en" for hits in merged for hit in hits)
+    return [[hit["text"] for hit in hits] for hits in merged]
+
+def main():
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((NUM_PASSAGES, DIMENSION)).astype("float32")
+    queries = rng.standard_normal((4, DIMENSION)).astype("float32")
+    all_members = list(range(NUM_PASSAGES))
+
+    with tempfile.TemporaryDirectory() as base_folder:
+        os.environ['BASE_FOLDER'] = base_folder
+        write_shards(Path(base_folder) / "website" / "content" / "k8s_sharded_index", vectors)
+
+        workers, endpoints = start_local_workers(NUM_SHARDS)
+        silent = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            problems = wait_until_healthy(workers, endpoints, timeout=60)
+            assert not problems, problems
+            print("✅ Local workers healthy")
+
+            merged, failed, answered = scatter_gather(endpoints, queries, k=K, timeout=5)
+            assert not failed and answered == set(range(NUM_SHARDS)), (failed, answered)
+            assert texts(merged) == expected_top_k(vectors, all_members, queries)
+            print("✅ Merged top-k matches a single flat index")
+
+            # Same shard reachable twice, like a repeated endpoint or a load-balanced Service
+            merged, failed, answered = scatter_gather(endpoints + [endpoints[0]], queries, k=K, timeout=5)
+            assert answered == set(range(NUM_SHARDS)), answered
+            assert texts(merged) == expected_top_k(vectors, all_members, queries)
+            print("✅ Duplicate replies from one shard are merged once")
+
+            problems = wait_until_healthy(workers[:2], endpoints[1::-1], timeout=10)
+            assert len(problems) == 2 and all("expected" in r for r in problems.values()), problems
+            print("✅ Worker serving the wrong shard is rejected")
+
+            for payload in ({"vectors": [0.0] * DIMENSION}, {"vectors": [[0.0] * (DIMENSION + 1)]}):
+                try:
+                    http_json(f"{endpoints[0]}/search", payload, timeout=5)
+                    raise AssertionError(f"Expected 400 for {payload}")
+                except urllib.error.HTTPError as e:
+                    assert e.code == 400, e.code
+            print("✅ Bad query vectors get a 400")
+
+            # Accepts connections but never replies, like a hung pod
+            silent.bind(("127.0.0.1", 0))
+            silent.listen(1)
+            silent_endpoint = f"http://127.0.0.1:{silent.getsockname()[1]}"
+            merged, failed, _ = scatter_gather(endpoints + [silent_endpoint], queries, k=K, timeout=1)
+            assert [e for e, _ in failed] == [silent_endpoint], failed
+            assert texts(merged) == expected_top_k(vectors, all_members, queries)
+            print("✅ Timed-out shard is skipped")
+
+            workers[2].terminate()
+            workers[2].wait()
+            problems = wait_until_healthy(workers, endpoints, timeout=10)
+            assert list(problems) == [endpoints[2]] and "exited" in problems[endpoints[2]], problems
+            print("✅ Exited worker is reported by the health check")
+
+            merged, failed, answered = scatter_gather(endpoints, queries, k=K, timeout=5, min_shards=2)
+            assert [e for e, _ in failed] == [endpoints[2]] and answered == {0, 1}, (failed, answered)
+            live_members = [i for i in all_members if i % NUM_SHARDS != 2]
+            assert texts(merged) == expected_top_k(vectors, live_members, queries)
+            print("✅ Dead shard is skipped, partial results merged from the rest")
+
+            try:
+                # Listing shard 0 twice must not count as a third shard
+                scatter_gather(endpoints + [endpoints[0]], queries, k=K, timeout=5, min_shards=NUM_SHARDS)
+                raise AssertionError("Expected MIN_SHARDS failure")
+            except RuntimeError:
+                pass
+            print("✅ MIN_SHARDS enforced")
+        finally:
+            silent.close()
+            stop_workers(workers)
+
+if __name__ == "__main__":
+    main()
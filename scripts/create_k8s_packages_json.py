@@ -3,8 +3,10 @@ from pathlib import Path
 import json
 
 BASE_FOLDER = os.environ['BASE_FOLDER']
-# Define base directory where markdown files are located
-base_dir = Path(f"{BASE_FOLDER}/website/content/en/docs")
+content_dir = Path(f"{BASE_FOLDER}/website/content")
+# Comma separated docs trees under website/content to extract (e.g. "en,de,ja"),
+# or "all" for every website/content/*/docs. Each tree gets its own k8s_passages.json.
+LOCALES = os.environ.get('LOCALES', 'en')
 
 # Function to extract passages from markdown files
 '''
@@ -42,14 +44,22 @@ def extract_passages_from_markdown(md_path, min_words=50, max_words=200):
                 yield joined
             block, block_words = [], 0
 
-# Extract all passages
-all_passages = []
-for md_file in base_dir.rglob("*.md"):
-    all_passages.extend(extract_passages_from_markdown(md_file))
+if LOCALES.strip() == "all":
+    docs_dirs = sorted(p for p in content_dir.glob("*/docs") if p.is_dir())
+else:
+    docs_dirs = [content_dir / locale.strip() / "docs" for locale in LOCALES.split(",") if locale.strip()]
 
-# Save to a JSON file for later use
-output_path = Path(f"{base_dir}/k8s_passages.json")
-with open(output_path, "w", encoding="utf-8") as f:
-    json.dump(all_passages, f, indent=2)
+for base_dir in docs_dirs:
+    if not base_dir.is_dir():
+        raise FileNotFoundError(f"No docs tree at {base_dir}")
 
-output_path
\ No newline at end of file
+    # Extract all passages
+    all_passages = []
+    for md_file in base_dir.rglob("*.md"):
+        all_passages.extend(extract_passages_from_markdown(md_file))
+
+    # Save to a JSON file for later use
+    output_path = base_dir / "k8s_passages.json"
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(all_passages, f, indent=2)
+    print(f"{base_dir.parent.name}: {len(all_passages)} passages -> {output_path}")
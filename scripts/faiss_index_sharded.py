@@ -0,0 +1,75 @@
+import os
+from pathlib import Path
+
+import json
+
+from retrieval_engine import EMBEDDING_MODEL, RetrievalEngine, sentence_transformer_encoder
+
+'''
+Builds a sharded FAISS index so the corpus no longer has to fit in a single pod.
+Every docs tree under website/content/* that has a k8s_passages.json (one per
+docs version / localization) is added to the corpus, and passages are assigned
+to shards round-robin so each shard holds a similar slice of every locale.
+Shards are built one after another, so the build only needs memory for one
+shard, not the whole corpus. Each shard is a retrieval engine folder
+(see retrieval_engine.py) served by its own scripts/shard_worker.py process.
+'''
+
+BASE_FOLDER = os.environ['BASE_FOLDER']
+NUM_SHARDS = int(os.environ.get('NUM_SHARDS', '4'))
+# flat (exact, default), hnsw or ivf
+INDEX_TYPE = os.environ.get('INDEX_TYPE', 'flat')
+content_dir = Path(BASE_FOLDER) / "website" / "content"
+output_dir = content_dir / "k8s_sharded_index"
+output_dir.mkdir(parents=True, exist_ok=True)
+
+def iter_corpus():
+    # Stream (locale, passage) pairs, one docs tree in memory at a time
+    for passages_file in sorted(content_dir.glob("*/docs/k8s_passages.json")):
+        locale = passages_file.parent.parent.name
+        with open(passages_file, "r", encoding="utf-8") as f:
+            locale_passages = json.load(f)
+        for passage in locale_passages:
+            yield locale, passage
+
+if not any(content_dir.glob("*/docs/k8s_passages.json")):
+    raise FileNotFoundError(f"No k8s_passages.json found under {content_dir}/*/docs")
+num_passages = sum(1 for _ in iter_corpus())
+if num_passages < NUM_SHARDS:
+    raise ValueError(f"NUM_SHARDS={NUM_SHARDS} is larger than the corpus ({num_passages} passages)")
+
+# Passage encoder, shared by all shards
+encoder = sentence_transformer_encoder(EMBEDDING_MODEL)
+
+# Build one shard at a time so only a single shard's passages and vectors are
+# ever in memory. Passages are assigned round-robin, each one is encoded once.
+shards = []
+for shard_id in range(NUM_SHARDS):
+    members = [
+        item for position, item in enumerate(iter_corpus())
+        if position % NUM_SHARDS == shard_id
+    ]
+    folder = f"shard_{shard_id}"
+    engine = RetrievalEngine.build(
+        [passage for _, passage in members],
+        output_dir / folder,
+        encoder=encoder,
+        model_name=EMBEDDING_MODEL,
+        index_type=INDEX_TYPE,
+        metadatas=[{"source": locale} for locale, _ in members]
+    )
+    size = engine.index.ntotal
+    del engine, members
+
+    shards.append({"shard_id": shard_id, "folder": folder, "size": size})
+    print(f"Shard {shard_id}: {size} passages")
+
+# Save manifest used by the workers and the coordinator
+manifest = {
+    "model": EMBEDDING_MODEL,
+    "index_type": INDEX_TYPE,
+    "num_shards": NUM_SHARDS,
+    "shards": shards,
+}
+with open(output_dir / "manifest.json", "w", encoding="utf-8") as f:
+    json.dump(manifest, f, indent=2)
@@ -1,15 +1,14 @@
-from sentence_transformers import SentenceTransformer, CrossEncoder, InputExample
+from sentence_transformers import CrossEncoder, InputExample
 from torch.utils.data import DataLoader
-import faiss
-import json
 import os
 from pathlib import Path
 import re
 
+from retrieval_engine import RetrievalEngine
+
 # -------- CONFIG --------
 BASE_FOLDER = os.environ['BASE_FOLDER']
 base_dir = Path(BASE_FOLDER) / "website" / "content" / "en" / "docs"
-embedding_model_name = "all-MiniLM-L6-v2"
 cross_encoder_model_name = "cross-encoder/ms-marco-MiniLM-L-6-v2"
 output_cross_encoder_path = f"{base_dir}/fine_tuned_cross_encoder"
 
@@ -18,11 +17,7 @@ def strip_tags(text):
     return re.sub(r'<[^>]+>', '', text)
 
 # -------- LOAD INDEX AND PASSAGES --------
-index = faiss.read_index(str(base_dir / "k8s_faiss.index"))
-with open(base_dir / "k8s_passage_metadata.json", "r", encoding="utf-8") as f:
-    passages = json.load(f)
-
-embed_model = SentenceTransformer(embedding_model_name)
+engine = RetrievalEngine.load(base_dir)
 
 # -------- DEFINE SAMPLE QUERIES --------
 sample_queries = [
@@ -38,17 +33,18 @@ sample_queries = [
     "How does Kubernetes manage container networking?"
 ]
 
-# -------- GENERATE EMBEDDINGS AND FAISS SEARCH --------
-query_vecs = embed_model.encode(sample_queries, convert_to_numpy=True)
-D, I = index.search(query_vecs, k=5)
+# -------- BATCHED EMBEDDING AND FAISS SEARCH --------
+results = engine.search(sample_queries, k=5)
 
 # -------- CREATE TRIPLETS FOR CROSS ENCODER --------
 labeled_examples = []
 
-for idx, hits in enumerate(I):
+for idx, hits in enumerate(results):
     query = sample_queries[idx]
-    pos = strip_tags(passages[hits[0]])
-    negatives = [strip_tags(passages[h]) for h in hits[1:4]]
+    if len(hits) < 4:
+        continue
+    pos = strip_tags(hits[0][0])
+    negatives = [strip_tags(passage) for passage, _ in hits[1:4]]
 
     labeled_examples.append(InputExample(texts=[query, pos], label=1.0))
     for neg in negatives:
@@ -1,13 +1,12 @@
 import os
-import json
 import re
 from pathlib import Path
 
-import faiss
 from torch.utils.data import DataLoader
 from sentence_transformers import CrossEncoder, InputExample
 from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_community.vectorstores import FAISS
+
+from retrieval_engine_langchain import EngineVectorStore
 
 # -------- CONFIG --------
 BASE_FOLDER = os.environ['BASE_FOLDER']
@@ -21,15 +20,9 @@ def strip_tags(text):
     return re.sub(r'<[^>]+>', '', text)
 
 # -------- LOAD PASSAGES AND INDEX --------
-with open(base_dir / "k8s_passage_metadata.json", "r", encoding="utf-8") as f:
-    passages = json.load(f)
-
 embedding_model = HuggingFaceEmbeddings(model_name=embedding_model_name)
-vectorstore = FAISS.load_local(
-    str(base_dir / "faiss_langchain_index"),
-    embedding_model,
-    allow_dangerous_deserialization=True
-)
+# MiniLM is symmetric, so query cache misses are embedded in one batch
+vectorstore = EngineVectorStore.load_local(base_dir, embedding_model, symmetric_queries=True)
 # -------- DEFINE SAMPLE QUERIES --------
 sample_queries = [
     "How does Kubernetes handle service discovery?",
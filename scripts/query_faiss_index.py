@@ -1,12 +1,12 @@
 import os
 from pathlib import Path
-import faiss
-import json
 import torch
 import re
-from sentence_transformers import SentenceTransformer, CrossEncoder
+from sentence_transformers import CrossEncoder
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
 
+from retrieval_engine import RetrievalEngine
+
 def strip_tags(text):
     return re.sub(r'<[^>]+>', '', text)
 
@@ -26,13 +26,10 @@ def main():
     BASE_FOLDER = os.environ['BASE_FOLDER']
     base_dir = Path(BASE_FOLDER) / "website" / "content" / "en" / "docs"
 
-    # Load FAISS index and metadata
-    index = faiss.read_index(str(base_dir / "k8s_faiss.index"))
-    with open(base_dir / "k8s_passage_metadata.json", "r", encoding="utf-8") as f:
-        passages = json.load(f)
+    # Load FAISS index, passage metadata and embedding model
+    engine = RetrievalEngine.load(base_dir)
 
     # Load models
-    embed_model = SentenceTransformer("all-MiniLM-L6-v2")
     tokenizer = AutoTokenizer.from_pretrained("google/flan-t5-base")
     model = AutoModelForSeq2SeqLM.from_pretrained("google/flan-t5-base")
     model.eval()
@@ -46,14 +43,13 @@ def main():
         "What are Init Containers?"
     ]
 
-    # Encode and retrieve
-    query_vecs = embed_model.encode(sample_queries, convert_to_numpy=True)
-    D, I = index.search(query_vecs, k=10)  # fetch more to allow re-ranking
+    # Encode and retrieve in one batch
+    results = engine.search(sample_queries, k=10)  # fetch more to allow re-ranking
 
     # Generate answers
-    for idx, hits in enumerate(I):
+    for idx, hits in enumerate(results):
         query = sample_queries[idx]
-        candidates = [strip_tags(passages[h]) for h in hits]
+        candidates = [strip_tags(passage) for passage, _ in hits]
         pairs = [[query, c] for c in candidates]
 
         # Re-rank using cross encoder
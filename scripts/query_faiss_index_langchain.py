@@ -1,5 +1,4 @@
 import os
-import json
 import torch
 import re
 from pathlib import Path
@@ -7,7 +6,8 @@ from pathlib import Path
 from sentence_transformers import CrossEncoder
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
 from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_community.vectorstores import FAISS
+
+from retrieval_engine_langchain import EngineVectorStore
 
 # -------- HELPERS --------
 def strip_tags(text):
@@ -30,17 +30,10 @@ def main():
     BASE_FOLDER = os.environ['BASE_FOLDER']
     base_dir = Path(BASE_FOLDER) / "website" / "content" / "en" / "docs"
 
-    # Load metadata
-    with open(base_dir / "k8s_passage_metadata.json", "r", encoding="utf-8") as f:
-        passages = json.load(f)
-
-    # Load vectorstore (LangChain FAISS wrapper)
+    # Load vectorstore (LangChain adapter over the shared retrieval engine)
     embedding_model = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
-    vectorstore = FAISS.load_local(
-        str(base_dir / "faiss_langchain_index"),
-        embedding_model,
-        allow_dangerous_deserialization=True
-    )
+    # MiniLM is symmetric, so query cache misses are embedded in one batch
+    vectorstore = EngineVectorStore.load_local(base_dir, embedding_model, symmetric_queries=True)
     # Load cross encoder
     cross_encoder = CrossEncoder(str(base_dir / "fine_tuned_cross_encoder"))
 
@@ -55,9 +48,11 @@ def main():
         "What are Init Containers?"
     ]
 
+    # Retrieve for all queries in one batch
+    retrieved = vectorstore.similarity_search_batch(sample_queries, k=10)
+
     # Loop through queries
-    for query in sample_queries:
-        docs = vectorstore.similarity_search(query, k=10)
+    for query, docs in zip(sample_queries, retrieved):
         raw_passages = [strip_tags(doc.page_content) for doc in docs]
 
         # Re-rank with cross encoder
@@ -0,0 +1,114 @@
+import os
+import json
+import torch
+import re
+from pathlib import Path
+from sentence_transformers import CrossEncoder
+from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+
+from retrieval_engine import QueryCache, sentence_transformer_encoder
+from shard_coordinator import scatter_gather, start_local_workers, stop_workers, wait_until_healthy
+
+'''
+Coordinator for sharded retrieval. Scatters the query embeddings to every
+shard_worker.py, gathers each shard's top-k with distances, merges them into a
+global top-k and re-ranks the merged candidates with the cross encoder.
+
+SHARD_ENDPOINTS   comma separated worker URLs (e.g. the pod DNS names). When
+                  unset, one local worker process per shard is started instead.
+SHARD_TIMEOUT     seconds to wait for the shards before giving up on them.
+MIN_SHARDS        minimum number of shards that must answer; fewer is an error,
+                  anything in between is served as a partial result.
+'''
+
+def strip_tags(text):
+    return re.sub(r'<[^>]+>', '', text)
+
+def generate_answer(prompt, tokenizer, model):
+    inputs = tokenizer(prompt, return_tensors="pt")
+    with torch.no_grad():
+        outputs = model.generate(
+            **inputs,
+            max_length=1024,
+            min_new_tokens=64,
+            num_beams=3,
+            early_stopping=True
+        )
+    return tokenizer.decode(outputs[0], skip_special_tokens=True)
+
+def main():
+    BASE_FOLDER = os.environ['BASE_FOLDER']
+    base_dir = Path(BASE_FOLDER) / "website" / "content" / "en" / "docs"
+    shard_dir = Path(BASE_FOLDER) / "website" / "content" / "k8s_sharded_index"
+    shard_timeout = float(os.environ.get('SHARD_TIMEOUT', '5'))
+    min_shards = int(os.environ.get('MIN_SHARDS', '1'))
+
+    with open(shard_dir / "manifest.json", "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    # Connect to the shard workers, or start local ones
+    workers = []
+    if os.environ.get('SHARD_ENDPOINTS'):
+        endpoints = [e.strip().rstrip("/") for e in os.environ['SHARD_ENDPOINTS'].split(",") if e.strip()]
+    else:
+        workers, endpoints = start_local_workers(manifest["num_shards"])
+        problems = wait_until_healthy(workers, endpoints)
+        for endpoint, reason in problems.items():
+            print(f"⚠️ Local worker {endpoint} skipped: {reason}")
+        endpoints = [e for e in endpoints if e not in problems]
+
+    try:
+        # Load models
+        query_cache = QueryCache(sentence_transformer_encoder(manifest["model"]))
+        tokenizer = AutoTokenizer.from_pretrained("google/flan-t5-base")
+        model = AutoModelForSeq2SeqLM.from_pretrained("google/flan-t5-base")
+        model.eval()
+
+        # Load fine-tuned cross encoder
+        cross_encoder = CrossEncoder(Path(base_dir) / "fine_tuned_cross_encoder")
+
+        # Define queries
+        sample_queries = [
+            "How does Kubernetes handle service discovery?",
+            "What are Init Containers?"
+        ]
+
+        # Encode and retrieve from all shards
+        query_vecs = query_cache.embed(sample_queries)
+        merged, failed, answered = scatter_gather(endpoints, query_vecs, k=10, timeout=shard_timeout,
+                                                  min_shards=min_shards)
+        missing = sorted(set(range(manifest["num_shards"])) - answered)
+        if missing:
+            print(f"⚠️ Partial results from {len(answered)} of {manifest['num_shards']} shards, "
+                  f"missing shards: {', '.join(map(str, missing))}")
+
+        # Generate answers
+        for idx, hits in enumerate(merged):
+            query = sample_queries[idx]
+            candidates = [strip_tags(hit["text"]) for hit in hits]
+            if not candidates:
+                print(f"\nNo passages retrieved for: {query}")
+                continue
+            pairs = [[query, c] for c in candidates]
+
+            # Re-rank using cross encoder
+            scores = cross_encoder.predict(pairs)
+            reranked = [c for _, c in sorted(zip(scores, candidates), reverse=True)]
+            context = "\n".join(reranked[:3])
+
+            prompt = (
+                f"You are a Kubernetes expert. Use the context below to answer the question.\n\n"
+                f"Context:\n{context}\n\n"
+                f"Question: {query}\n\n"
+                f"Answer:"
+            )
+
+            print(f"\nQuery Sharded FAISS + CrossEncoder + Generation: {query}")
+            output = generate_answer(prompt, tokenizer, model)
+            print(output)
+            print("\n")
+    finally:
+        stop_workers(workers)
+
+if __name__ == "__main__":
+    main()
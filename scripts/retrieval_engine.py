@@ -0,0 +1,237 @@
+import json
+from collections import OrderedDict
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+'''
+Single retrieval engine shared by the plain FAISS, LangChain and sharded
+pipelines.
+
+On-disk format (written by RetrievalEngine.save into one folder):
+
+    k8s_faiss.index               FAISS index, row i is passage i
+    k8s_passage_metadata.json     list of passage strings
+    k8s_document_metadata.json    list of metadata dicts, only when any are set
+    k8s_retrieval_engine.json     embedding model, index type and search settings
+
+Loading is a faiss.read_index plus JSON reads, no pickled docstore, and the
+embedding model is only loaded on the first query. Query embeddings are
+computed in batches and kept in an LRU cache, so repeated queries skip the
+embedding model entirely.
+'''
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+INDEX_FILE = "k8s_faiss.index"
+PASSAGES_FILE = "k8s_passage_metadata.json"
+METADATA_FILE = "k8s_document_metadata.json"
+CONFIG_FILE = "k8s_retrieval_engine.json"
+INDEX_TYPES = ("flat", "hnsw", "ivf")
+
+def sentence_transformer_encoder(model_name=EMBEDDING_MODEL, batch_size=64):
+    # The model is loaded on first use, so processes that only search by vector never load it
+    model = None
+
+    def encode(texts, show_progress_bar=False):
+        nonlocal model
+        if model is None:
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer(model_name)
+        return model.encode(texts, batch_size=batch_size, convert_to_numpy=True,
+                            show_progress_bar=show_progress_bar)
+    return encode
+
+def build_index(embeddings, index_type="flat", nlist=None, hnsw_m=32):
+    '''
+    flat: exact search, same results as the original IndexFlatL2
+    hnsw: graph index, much faster queries on large corpora, approximate
+    ivf:  inverted lists over k-means cells, trained on the corpus, approximate
+    '''
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"index_type must be one of {INDEX_TYPES}, got {index_type!r}")
+    dimension = embeddings.shape[1]
+
+    if index_type == "flat":
+        index = faiss.IndexFlatL2(dimension)
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dimension, hnsw_m)
+    else:
+        # FAISS wants roughly 39 training points per cell
+        nlist = nlist or max(1, min(int(4 * np.sqrt(len(embeddings))), len(embeddings) // 39))
+        quantizer = faiss.IndexFlatL2(dimension)
+        index = faiss.IndexIVFFlat(quantizer, dimension, nlist)
+        index.train(embeddings)
+    index.add(embeddings)
+    return index
+
+class QueryCache:
+    '''LRU cache of query embeddings in front of an encoder. Misses are encoded in one batch.'''
+
+    def __init__(self, encoder, size=1024, dimension=None):
+        self.encoder = encoder
+        self.size = size
+        self.dimension = dimension
+        self._cache = OrderedDict()
+
+    def embed(self, queries):
+        if not queries:
+            return np.empty((0, self.dimension or 0), dtype="float32")
+        vectors = {q: self._cache[q] for q in queries if q in self._cache}
+        for query in vectors:
+            self._cache.move_to_end(query)
+
+        missing = [q for q in dict.fromkeys(queries) if q not in vectors]
+        if missing:
+            encoded = np.asarray(self.encoder(missing), dtype="float32")
+            for query, vector in zip(missing, encoded):
+                vectors[query] = vector
+                self._remember(query, vector)
+
+        return np.vstack([vectors[q] for q in queries]).astype("float32", copy=False)
+
+    def _remember(self, query, vector):
+        if self.size <= 0:
+            return
+        self._cache[query] = vector
+        self._cache.move_to_end(query)
+        while len(self._cache) > self.size:
+            self._cache.popitem(last=False)
+
+    def clear(self):
+        self._cache.clear()
+
+class RetrievalEngine:
+    '''
+    encoder embeds passages (build / add), query_encoder embeds queries and
+    defaults to encoder; they differ for models that embed queries with an
+    instruction or prefix.
+    '''
+
+    def __init__(self, index, passages, encoder, config=None, cache_size=1024,
+                 metadatas=None, query_encoder=None):
+        if index.ntotal != len(passages):
+            raise ValueError(f"Index has {index.ntotal} vectors but there are {len(passages)} passages")
+        if metadatas is not None and len(metadatas) != len(passages):
+            raise ValueError(f"Got {len(metadatas)} metadatas for {len(passages)} passages")
+        self.index = index
+        self.passages = passages
+        self.metadatas = [dict(m or {}) for m in metadatas] if metadatas is not None else [{} for _ in passages]
+        self.encoder = encoder
+        self.config = config or {}
+        self.query_cache = QueryCache(query_encoder or encoder, size=cache_size, dimension=index.d)
+        self._apply_search_settings()
+
+    def _apply_search_settings(self):
+        if "nprobe" in self.config and hasattr(self.index, "nprobe"):
+            self.index.nprobe = self.config["nprobe"]
+        if "ef_search" in self.config and hasattr(self.index, "hnsw"):
+            self.index.hnsw.efSearch = self.config["ef_search"]
+
+    @classmethod
+    def build(cls, passages, folder, encoder=None, model_name=EMBEDDING_MODEL,
+              index_type="flat", cache_size=1024, metadatas=None, query_encoder=None, **index_kwargs):
+        passages = list(passages)
+        if not passages:
+            raise ValueError("Cannot build an index from an empty passage list")
+        if encoder is None:
+            if model_name is None:
+                raise ValueError("Pass an encoder or a model_name to build the index")
+            encoder = sentence_transformer_encoder(model_name)
+        embeddings = np.asarray(encoder(passages, show_progress_bar=True), dtype="float32")
+        index = build_index(embeddings, index_type=index_type, **index_kwargs)
+
+        config = {"model": model_name, "index_type": index_type, "dimension": int(embeddings.shape[1])}
+        if index_type == "ivf":
+            config["nprobe"] = 16
+        elif index_type == "hnsw":
+            config["ef_search"] = 64
+
+        engine = cls(index, passages, encoder, config=config, cache_size=cache_size,
+                     metadatas=metadatas, query_encoder=query_encoder)
+        if folder is not None:
+            engine.save(folder)
+        return engine
+
+    @classmethod
+    def load(cls, folder, encoder=None, cache_size=1024, query_encoder=None):
+        folder = Path(folder)
+        if (folder / CONFIG_FILE).exists():
+            with open(folder / CONFIG_FILE, "r", encoding="utf-8") as f:
+                config = json.load(f)
+        else:
+            # Index written by the original faiss_index.py, always MiniLM + IndexFlatL2
+            config = {"model": EMBEDDING_MODEL, "index_type": "flat"}
+
+        index = faiss.read_index(str(folder / INDEX_FILE))
+        if config.get("dimension", index.d) != index.d:
+            raise ValueError(f"{folder / CONFIG_FILE} says dimension {config['dimension']} "
+                             f"but the index has dimension {index.d}")
+        with open(folder / PASSAGES_FILE, "r", encoding="utf-8") as f:
+            passages = json.load(f)
+        metadatas = None
+        if (folder / METADATA_FILE).exists():
+            with open(folder / METADATA_FILE, "r", encoding="utf-8") as f:
+                metadatas = json.load(f)
+
+        if encoder is None:
+            if not config.get("model"):
+                raise ValueError(f"{folder} does not record which embedding model built it, "
+                                 f"pass the encoder it was built with")
+            encoder = sentence_transformer_encoder(config["model"])
+        return cls(index, passages, encoder, config=config, cache_size=cache_size,
+                   metadatas=metadatas, query_encoder=query_encoder)
+
+    def save(self, folder):
+        folder = Path(folder)
+        folder.mkdir(parents=True, exist_ok=True)
+        faiss.write_index(self.index, str(folder / INDEX_FILE))
+        with open(folder / PASSAGES_FILE, "w", encoding="utf-8") as f:
+            json.dump(self.passages, f)
+        if any(self.metadatas):
+            with open(folder / METADATA_FILE, "w", encoding="utf-8") as f:
+                json.dump(self.metadatas, f)
+        elif (folder / METADATA_FILE).exists():
+            (folder / METADATA_FILE).unlink()
+        with open(folder / CONFIG_FILE, "w", encoding="utf-8") as f:
+            json.dump(self.config, f, indent=2)
+
+    def embed(self, queries):
+        return self.query_cache.embed(queries)
+
+    def clear_cache(self):
+        self.query_cache.clear()
+
+    def search_vectors(self, vectors, k=10):
+        '''Returns, per query vector, a list of (passage_id, distance) sorted by distance.'''
+        vectors = np.asarray(vectors, dtype="float32")
+        if vectors.size == 0:
+            return []
+        if vectors.ndim != 2 or vectors.shape[1] != self.index.d:
+            raise ValueError(f"Query vectors must have shape (n, {self.index.d}), got {vectors.shape}")
+        if self.index.ntotal == 0:
+            return [[] for _ in range(len(vectors))]
+        D, I = self.index.search(vectors, min(k, self.index.ntotal))
+        return [
+            [(int(h), float(d)) for d, h in zip(distances, hits) if h != -1]
+            for distances, hits in zip(D, I)
+        ]
+
+    def search(self, queries, k=10):
+        '''Batched search. Returns, per query, a list of (passage, distance).'''
+        if isinstance(queries, str):
+            queries = [queries]
+        hits = self.search_vectors(self.embed(queries), k=k)
+        return [[(self.passages[h], d) for h, d in row] for row in hits]
+
+    def add(self, texts, metadatas=None):
+        '''Adds passages to the index and returns their passage ids.'''
+        texts = list(texts)
+        if metadatas is not None and len(metadatas) != len(texts):
+            raise ValueError(f"Got {len(metadatas)} metadatas for {len(texts)} texts")
+        vectors = np.asarray(self.encoder(texts), dtype="float32")
+        start = len(self.passages)
+        self.index.add(vectors)
+        self.passages.extend(texts)
+        self.metadatas.extend(dict(m or {}) for m in (metadatas or [{}] * len(texts)))
+        return list(range(start, len(self.passages)))
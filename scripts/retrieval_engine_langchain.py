@@ -0,0 +1,121 @@
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from retrieval_engine import RetrievalEngine
+
+'''
+Thin LangChain VectorStore over RetrievalEngine. It reads and writes the same
+on-disk index as the plain FAISS scripts, so both pipelines share one index,
+one query cache and the same index-type options. Use .as_retriever() for the
+standard LangChain retriever interface.
+
+Queries go through embed_query, one call per query that misses the cache,
+because instruction / prefix models embed queries differently from passages.
+For symmetric models such as all-MiniLM-L6-v2, pass symmetric_queries=True
+to embed all cache misses in one embed_documents batch instead.
+'''
+
+def langchain_encoder(embedding):
+    # Passages go through embed_documents
+    def encode(texts, show_progress_bar=False):
+        return np.asarray(embedding.embed_documents(list(texts)), dtype="float32")
+    return encode
+
+def langchain_query_encoder(embedding, symmetric_queries=False):
+    if symmetric_queries:
+        return langchain_encoder(embedding)
+
+    def encode(queries):
+        return np.asarray([embedding.embed_query(q) for q in queries], dtype="float32")
+    return encode
+
+class EngineEmbeddings(Embeddings):
+    '''Exposes the engine's encoders (and its query cache) as LangChain Embeddings.'''
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def embed_documents(self, texts):
+        return np.asarray(self.engine.encoder(list(texts)), dtype="float32").tolist()
+
+    def embed_query(self, text):
+        return self.engine.embed([text])[0].tolist()
+
+class EngineVectorStore(VectorStore):
+    def __init__(self, engine, embedding=None):
+        self.engine = engine
+        self._embedding = embedding or EngineEmbeddings(engine)
+
+    @property
+    def embeddings(self):
+        return self._embedding
+
+    def _to_documents(self, rows):
+        return [
+            (Document(page_content=self.engine.passages[h],
+                      metadata={**self.engine.metadatas[h], "passage_id": h}), d)
+            for h, d in rows
+        ]
+
+    def add_texts(self, texts, metadatas=None, **kwargs):
+        return [str(i) for i in self.engine.add(texts, metadatas=metadatas)]
+
+    def similarity_search_with_score(self, query, k=4, **kwargs):
+        return self.similarity_search_with_score_by_vector(self.engine.embed([query])[0], k=k)
+
+    def similarity_search_with_score_by_vector(self, embedding, k=4, **kwargs):
+        return self._to_documents(self.engine.search_vectors([embedding], k=k)[0])
+
+    def similarity_search(self, query, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k)]
+
+    def similarity_search_by_vector(self, embedding, k=4, **kwargs):
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k=k)]
+
+    def similarity_search_batch(self, queries, k=4):
+        '''
+        One index search for several queries. Cache misses are embedded in one
+        embed_documents batch with symmetric_queries, else one embed_query each.
+        '''
+        rows = self.engine.search_vectors(self.engine.embed(list(queries)), k=k)
+        return [[doc for doc, _ in self._to_documents(row)] for row in rows]
+
+    def _select_relevance_score_fn(self):
+        return self._euclidean_relevance_score_fn
+
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, folder_path=None, index_type="flat",
+                   cache_size=1024, symmetric_queries=False, **kwargs):
+        # Passage ids are row positions, so ids passed by from_documents are not used
+        kwargs.pop("ids", None)
+        engine = RetrievalEngine.build(
+            list(texts),
+            folder_path,
+            encoder=langchain_encoder(embedding),
+            query_encoder=langchain_query_encoder(embedding, symmetric_queries),
+            # Recorded for loading without embeddings; None when the class does not expose it
+            model_name=getattr(embedding, "model_name", None) or getattr(embedding, "model", None),
+            index_type=index_type,
+            cache_size=cache_size,
+            metadatas=metadatas,
+            **kwargs
+        )
+        return cls(engine, embedding)
+
+    @classmethod
+    def load_local(cls, folder_path, embeddings=None, cache_size=1024, symmetric_queries=False):
+        if embeddings is None:
+            engine = RetrievalEngine.load(folder_path, cache_size=cache_size)
+        else:
+            engine = RetrievalEngine.load(
+                folder_path,
+                encoder=langchain_encoder(embeddings),
+                query_encoder=langchain_query_encoder(embeddings, symmetric_queries),
+                cache_size=cache_size
+            )
+        return cls(engine, embeddings)
+
+    def save_local(self, folder_path):
+        self.engine.save(folder_path)
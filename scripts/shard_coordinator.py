@@ -0,0 +1,122 @@
+import os
+import sys
+import json
+import time
+import heapq
+import socket
+import subprocess
+import urllib.request
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait
+
+'''
+Scatter-gather helpers used by query_faiss_index_sharded.py to talk to the
+shard_worker.py processes, plus starting local workers in place of pods.
+Only uses the standard library so it can be exercised without the models
+(see check_sharded_retrieval.py).
+'''
+
+def http_json(url, payload=None, timeout=None):
+    data = None if payload is None else json.dumps(payload).encode("utf-8")
+    request = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def start_local_workers(num_shards):
+    # Local processes standing in for the worker pods, each on a fresh port
+    workers, endpoints = [], []
+    script = Path(__file__).resolve().parent / "shard_worker.py"
+    for shard_id in range(num_shards):
+        port = free_port()
+        env = dict(os.environ, SHARD_ID=str(shard_id), SHARD_PORT=str(port))
+        workers.append(subprocess.Popen([sys.executable, str(script)], env=env))
+        endpoints.append(f"http://127.0.0.1:{port}")
+    return workers, endpoints
+
+def stop_workers(workers):
+    for worker in workers:
+        worker.terminate()
+    for worker in workers:
+        worker.wait()
+
+def wait_until_healthy(workers, endpoints, timeout=120):
+    '''
+    Waits for local worker i at endpoints[i] to serve shard i. Returns
+    {endpoint: reason} for workers that exited, answer for another shard or
+    never became ready; those endpoints should not be queried.
+    '''
+    deadline = time.time() + timeout
+    pending = dict(enumerate(endpoints))
+    problems = {}
+    while pending and time.time() < deadline:
+        for shard_id, endpoint in list(pending.items()):
+            exit_code = workers[shard_id].poll()
+            if exit_code is not None:
+                problems[endpoint] = f"worker exited with status {exit_code}"
+                del pending[shard_id]
+                continue
+            try:
+                health = http_json(f"{endpoint}/health", timeout=1)
+            except (OSError, ValueError):
+                continue
+            if health.get("shard_id") != shard_id:
+                problems[endpoint] = f"serves shard {health.get('shard_id')}, expected {shard_id}"
+            del pending[shard_id]
+        if pending:
+            time.sleep(0.5)
+    for endpoint in pending.values():
+        problems[endpoint] = f"not ready after {timeout}s"
+    return problems
+
+def scatter_gather(endpoints, query_vecs, k, timeout, min_shards=1):
+    '''
+    Sends the query vectors to every endpoint and merges the per-shard top-k
+    into a global top-k per query. Only the first reply per shard_id is used,
+    so an endpoint listed twice or a load-balanced Service cannot merge the
+    same shard twice. Endpoints that fail or miss the timeout are skipped and
+    returned as (endpoint, reason). Returns (merged, failed, answered_shard_ids);
+    fewer than min_shards distinct shards answering raises.
+    '''
+    payload = {"vectors": [list(map(float, vec)) for vec in query_vecs], "k": k}
+    pool = ThreadPoolExecutor(max_workers=max(1, len(endpoints)))
+    futures = {
+        pool.submit(http_json, f"{endpoint}/search", payload, timeout): endpoint
+        for endpoint in endpoints
+    }
+    done, not_done = wait(futures, timeout=timeout)
+    # Do not block on shards that missed the deadline
+    pool.shutdown(wait=False)
+
+    responses, failed = {}, []
+    for future in sorted(done, key=lambda f: endpoints.index(futures[f])):
+        endpoint = futures[future]
+        try:
+            response = future.result()
+        except Exception as e:
+            failed.append((endpoint, str(e)))
+            continue
+        shard_id = response.get("shard_id")
+        if shard_id in responses:
+            print(f"⚠️ Shard {shard_id} answered again from {endpoint}, ignoring duplicate")
+            continue
+        responses[shard_id] = response
+    for future in not_done:
+        future.cancel()
+        failed.append((futures[future], f"timed out after {timeout}s"))
+
+    for endpoint, reason in failed:
+        print(f"⚠️ Shard {endpoint} unavailable: {reason}")
+    if len(responses) < min_shards:
+        raise RuntimeError(f"Only {len(responses)} distinct shards answered, need {min_shards}")
+
+    # Merge per-shard top-k into a global top-k (smaller L2 distance is better)
+    merged = []
+    for query_idx in range(len(query_vecs)):
+        hits = [hit for response in responses.values() for hit in response["results"][query_idx]]
+        merged.append(heapq.nsmallest(k, hits, key=lambda hit: hit["distance"]))
+    return merged, failed, set(responses)
@@ -0,0 +1,102 @@
+import os
+import re
+import json
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from retrieval_engine import RetrievalEngine
+
+'''
+Retrieval worker for one shard of the index built by faiss_index_sharded.py.
+Runs as its own pod (or as a local process) and answers:
+
+    GET  /health  -> {"shard_id": ..., "size": ...}
+    POST /search  {"vectors": [[...], ...], "k": 10}
+                  -> {"shard_id": ..., "results": [[{"distance", "text", "source"}, ...], ...]}
+
+The shard id comes from SHARD_ID, or from the trailing ordinal of HOSTNAME
+when running as a StatefulSet pod (e.g. retrieval-worker-2 -> shard 2).
+'''
+
+def resolve_shard_id():
+    if 'SHARD_ID' in os.environ:
+        return int(os.environ['SHARD_ID'])
+    match = re.search(r'-(\d+)$', os.environ.get('HOSTNAME', ''))
+    if match is None:
+        raise ValueError("Set SHARD_ID or run with a HOSTNAME ending in the shard ordinal")
+    return int(match.group(1))
+
+def load_shard(shard_dir, shard_id):
+    with open(shard_dir / "manifest.json", "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    shard = manifest["shards"][shard_id]
+    # Queries arrive as vectors, so the embedding model is never loaded here
+    return RetrievalEngine.load(shard_dir / shard["folder"])
+
+def make_handler(shard_id, engine):
+    class ShardHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, body):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send_json(200, {"shard_id": shard_id, "size": engine.index.ntotal})
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/search":
+                self._send_json(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length).decode("utf-8"))
+                vectors = np.asarray(request["vectors"], dtype="float32")
+                k = int(request.get("k", 10))
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                self._send_json(400, {"error": str(e)})
+                return
+            if vectors.ndim != 2 or vectors.shape[1] != engine.index.d:
+                self._send_json(400, {"error": f"vectors must have shape (n, {engine.index.d}), got {vectors.shape}"})
+                return
+            if k < 1:
+                self._send_json(400, {"error": f"k must be at least 1, got {k}"})
+                return
+
+            results = [
+                [{"distance": d, "text": engine.passages[h], **engine.metadatas[h]} for h, d in row]
+                for row in engine.search_vectors(vectors, k=k)
+            ]
+            self._send_json(200, {"shard_id": shard_id, "results": results})
+
+        def log_message(self, format, *args):
+            pass
+
+    return ShardHandler
+
+def main():
+    BASE_FOLDER = os.environ['BASE_FOLDER']
+    shard_dir = Path(BASE_FOLDER) / "website" / "content" / "k8s_sharded_index"
+    port = int(os.environ.get('SHARD_PORT', '8000'))
+
+    shard_id = resolve_shard_id()
+    engine = load_shard(shard_dir, shard_id)
+
+    server = ThreadingHTTPServer(("0.0.0.0", port), make_handler(shard_id, engine))
+    print(f"Shard {shard_id} serving {engine.index.ntotal} passages on port {port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()